@@ -10,6 +10,7 @@ echo "\n\
 [server]\n\
 headless = true\n\
 enableCORS=false\n\
+enableStaticServing = true\n\
 port = $PORT\n\
 [client]\n\
 showErrorDetails = false\n\
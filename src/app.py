@@ -9,6 +9,9 @@ import streamlit as st
 
 from sidebar import show_sidebar
 from headerfooter import footer
+from telemetry import show_telemetry
+from prefetch import show_prefetch
+from service_worker import show_service_worker
 
 # set the page title and layout
 st.set_page_config(page_title="Michael Petrou - Portfolio", layout="wide", initial_sidebar_state="expanded", page_icon="💻")
@@ -22,3 +25,12 @@ if selected_page != None:
 
 # draw the page footer
 st.markdown(footer, unsafe_allow_html=True)
+
+# report the real-user timings of the page, when the collector is enabled
+show_telemetry(st.session_state.get("selected_page"), st.session_state.get("nav_pages"))
+
+# prefetch the likely next pages while the browser is idle
+show_prefetch(st.session_state.get("prefetch_funcs"))
+
+# register the offline cache for repeat visitors, when it is enabled
+show_service_worker()
@@ -0,0 +1,197 @@
+"""
+Sprite atlas build step for the portfolio thumbnails.
+
+This script packs every image in the image_folder of a portfolio content file
+into a single optimized atlas image, with a coordinate map of where each
+thumbnail is. show_section renders the thumbnails as CSS-offset views into the
+atlas, so a full page of thumbnails costs one request and one decode.
+
+The atlas is served through Streamlit static file serving, run with:
+    python src/atlas.py
+    streamlit run src/app.py --server.enableStaticServing true
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+
+import streamlit as st
+from PIL import Image
+
+
+logger = logging.getLogger(__name__)
+
+# the content files whose image_folder is packed into an atlas
+ATLAS_CONTENT = ["games.json", "simulation.json"]
+
+# the atlas is written to the streamlit static folder next to app.py, relative to the
+# repository root like the content and images folders
+ATLAS_FOLDER = os.path.join("src", "static", "atlas")
+ATLAS_URL = "app/static/atlas"
+
+# thumbnails are scaled down to this width, which is the largest they are shown at
+CELL_WIDTH = 260
+CELL_PADDING = 2
+JPEG_QUALITY = 85
+
+
+def _atlas_name(image_folder: str) -> str:
+    return os.path.basename(os.path.normpath(image_folder))
+
+
+def source_hash(image_folder: str, keys) -> str:
+    """
+    Hash the source images of an atlas, to tell if the atlas is older than its sources.
+    :param image_folder: The image_folder of the portfolio content file
+    :param keys: The keys of the items whose images are in the atlas
+    :return: The hash of the item keys and their image files
+    """
+    digest = hashlib.sha256()
+    for key in keys:
+        digest.update(key.encode())
+        with open(f"{image_folder}/{key}.jpg", "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_atlas(json_filename: str, atlas_folder=ATLAS_FOLDER) -> dict:
+    """
+    Pack the images of a portfolio content file into an atlas image and write the coordinate map.
+    :param json_filename: Name of the content file, such as games.json
+    :param atlas_folder: The folder to write the atlas image and coordinate map to
+    :return: The coordinate map of the atlas
+    """
+    with open(f"content/{json_filename}", "r") as file:
+        data = json.load(file)
+
+    image_folder = data["image_folder"]
+    name = _atlas_name(image_folder)
+
+    # scale the thumbnails that are wider than a cell down to the cell width, keeping the aspect ratio,
+    # narrower ones are kept at their own size as upscaling only makes the atlas larger.
+    # only the image headers are read here, so the thumbnails are not all held in memory at once
+    sizes = {}
+    for key in data["items"]:
+        with Image.open(f"{image_folder}/{key}.jpg") as img:
+            width = min(img.width, CELL_WIDTH)
+            sizes[key] = (width, round(img.height * width / img.width))
+
+    # pack the thumbnails into rows of a near square grid
+    columns = math.ceil(math.sqrt(len(sizes)))
+    keys = list(sizes)
+    rows = [keys[i:i + columns] for i in range(0, len(keys), columns)]
+    atlas_width = columns * (CELL_WIDTH + CELL_PADDING) - CELL_PADDING
+    atlas_height = sum(max(sizes[key][1] for key in row) for row in rows) + CELL_PADDING * (len(rows) - 1)
+
+    atlas = Image.new("RGB", (atlas_width, atlas_height))
+    items = {}
+    y = 0
+    for row in rows:
+        x = 0
+        for key in row:
+            with Image.open(f"{image_folder}/{key}.jpg") as img:
+                atlas.paste(img.convert("RGB").resize(sizes[key], Image.LANCZOS), (x, y))
+            items[key] = {"x": x, "y": y, "w": sizes[key][0], "h": sizes[key][1]}
+            x += CELL_WIDTH + CELL_PADDING
+        y += max(sizes[key][1] for key in row) + CELL_PADDING
+
+    os.makedirs(atlas_folder, exist_ok=True)
+    image_path = os.path.join(atlas_folder, f"{name}.jpg")
+    atlas.save(image_path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+    # the version is used to bust the browser cache when the atlas changes
+    with open(image_path, "rb") as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:12]
+
+    atlas_map = {
+        "image": f"{name}.jpg",
+        "version": version,
+        "source_hash": source_hash(image_folder, keys),
+        "width": atlas_width,
+        "height": atlas_height,
+        "items": items,
+    }
+    with open(os.path.join(atlas_folder, f"{name}.json"), "w") as f:
+        json.dump(atlas_map, f, indent=4)
+
+    return atlas_map
+
+
+def read_atlas(image_folder: str) -> dict:
+    """
+    Read the coordinate map of the atlas for an image folder from disk.
+    :param image_folder: The image_folder of the portfolio content file
+    :return: The coordinate map, or None if the atlas has not been built
+    """
+    map_path = os.path.join(ATLAS_FOLDER, f"{_atlas_name(image_folder)}.json")
+    if not os.path.exists(map_path):
+        return None
+
+    with open(map_path, "r") as f:
+        return json.load(f)
+
+
+@st.cache_data
+def load_atlas(image_folder: str) -> dict:
+    """
+    Load the coordinate map of the atlas for an image folder.
+    :param image_folder: The image_folder of the portfolio content file
+    :return: The coordinate map, or None if there is no atlas, it is out of date, or it cannot be served
+    """
+    if not st.get_option("server.enableStaticServing"):
+        return None
+
+    atlas = read_atlas(image_folder)
+    if atlas is None:
+        return None
+
+    # the atlas is a build artifact, so fall back to the source images when it has not been rebuilt
+    try:
+        current_hash = source_hash(image_folder, atlas["items"])
+    except OSError:
+        current_hash = None
+    if atlas.get("source_hash") != current_hash:
+        logger.warning("The atlas of %s is out of date, run python src/atlas.py to rebuild it", image_folder)
+        return None
+
+    return atlas
+
+
+def atlas_url(atlas: dict) -> str:
+    """
+    Get the URL of the atlas image, versioned so the browser cache is busted when it changes.
+    :param atlas: The coordinate map of the atlas
+    :return: The URL of the atlas image
+    """
+    return f"{ATLAS_URL}/{atlas['image']}?v={atlas['version']}"
+
+
+def atlas_thumbnail_html(atlas: dict, key: str) -> str:
+    """
+    Create the HTML for a thumbnail as a CSS-offset view into the atlas.
+    The view scales with the width of its column, like st.image with use_container_width.
+    :param atlas: The coordinate map of the atlas
+    :param key: The key of the thumbnail in the atlas
+    :return: The HTML for the thumbnail
+    """
+    item = atlas["items"][key]
+    size_x = atlas["width"] / item["w"] * 100
+    size_y = atlas["height"] / item["h"] * 100
+    position_x = item["x"] / (atlas["width"] - item["w"]) * 100 if atlas["width"] != item["w"] else 0
+    position_y = item["y"] / (atlas["height"] - item["h"]) * 100 if atlas["height"] != item["h"] else 0
+
+    return f"""
+        <div style="width: 100%; aspect-ratio: {item['w']} / {item['h']};
+            background-image: url('{atlas_url(atlas)}');
+            background-size: {size_x:.4f}% {size_y:.4f}%;
+            background-position: {position_x:.4f}% {position_y:.4f}%;">
+        </div>
+        """
+
+
+if __name__ == "__main__":
+    for json_filename in ATLAS_CONTENT:
+        atlas_map = build_atlas(json_filename)
+        print(f"{json_filename}: {len(atlas_map['items'])} thumbnails in a {atlas_map['width']}x{atlas_map['height']} atlas")
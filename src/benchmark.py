@@ -0,0 +1,361 @@
+"""
+Synthetic large-content scaling benchmark for the portfolio website.
+
+This script generates games.json and certification.json shaped content with
+placeholder images at several sizes in a temporary directory, builds the games
+thumbnail atlas, renders show_section, show_portfolio and show_certification
+against each size with the Streamlit app testing framework, and prints the
+scaling curve of render time, element count, payload bytes and peak memory, so
+non-linear behavior shows up before the real content grows to that size.
+
+show_section and show_portfolio are rendered both with the st.image fallback and
+with the atlas, which is what production uses as it enables static serving.
+
+Run with:
+    python src/benchmark.py --sizes 100 1000 10000 --output scaling.csv
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+
+import streamlit as st
+from PIL import Image
+from streamlit import config
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+SIZES = [100, 1000, 10000]
+
+# a growth factor above this, between two sizes, is reported as non-linear
+NON_LINEAR_GROWTH = 1.5
+
+# the size of the synthetic game thumbnails
+GAME_IMAGE_SIZE = (260, 330)
+
+# the atlas is held decoded in memory while it is built, so larger atlases are reported and skipped
+ATLAS_MEMORY_MB = 1024
+
+
+def _placeholder_image(width: int, height: int, index: int) -> bytes:
+    # every placeholder has the bits of its index drawn as blocks, as streamlit stores identical
+    # media files only once, and plain colors that are close can encode to the same jpeg
+    image = Image.new("RGB", (width, height), (index % 256, (index // 256) % 256, 128))
+    for bit in range(16):
+        if index >> bit & 1:
+            x, y = (bit % 4) * 16, (bit // 4) * 16
+            image.paste((255, 255, 255), (x, y, x + 16, y + 16))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def generate_content(root: str, size: int):
+    """
+    Write synthetic games.json and certification.json content, with placeholder images, under a directory.
+    The layout matches the repository, so the pages can be rendered with the directory as working directory.
+    :param root: The directory to write the content and images to
+    :param size: The number of items in each content file
+    """
+    os.makedirs(os.path.join(root, "content"), exist_ok=True)
+    games_folder = os.path.join(root, "images", "portfolio", "games")
+    certification_folder = os.path.join(root, "images", "portfolio", "certification")
+    os.makedirs(games_folder, exist_ok=True)
+    os.makedirs(certification_folder, exist_ok=True)
+
+    games = {"title": "Game Development", "image_folder": "images/portfolio/games", "items": {}}
+    for i in range(size):
+        key = f"game{i}"
+        games["items"][key] = {
+            "title": f"[STUDIO {i % 10}] Synthetic Game {i}",
+            "subtitle": "Lead Programmer:",
+            "line1": f"Developed the gameplay systems of synthetic game {i}",
+            "line2": "C and C++ on PC, PlayStation and Xbox",
+            "line3": "Led a team of programmers through to release",
+        }
+        with open(os.path.join(games_folder, f"{key}.jpg"), "wb") as f:
+            f.write(_placeholder_image(*GAME_IMAGE_SIZE, i))
+
+    certification = {"title": "AI/ML Certifications", "image_folder": "portfolio/certification/", "image_width": "500", "items": {}}
+    for i in range(size):
+        key = f"cert{i}"
+        certification["items"][key] = {
+            "org": f"Organisation {i % 10}",
+            "title": f"Synthetic Certification {i}",
+            "certificate_link": f"https://example.com/certificate/{i}",
+        }
+        with open(os.path.join(certification_folder, f"{key}.jpg"), "wb") as f:
+            f.write(_placeholder_image(500, 380, i))
+
+    with open(os.path.join(root, "content", "games.json"), "w") as f:
+        json.dump(games, f, indent=4)
+    with open(os.path.join(root, "content", "certification.json"), "w") as f:
+        json.dump(certification, f, indent=4)
+
+
+def synthetic_atlas_memory_mb(size: int) -> float:
+    """
+    Estimate the memory needed to build the atlas of the synthetic games content, before building it.
+    :param size: The number of items in the content
+    :return: The decoded size of the atlas in MB, as pillow holds it, with 4 bytes per RGB pixel
+    """
+    from atlas import CELL_PADDING, CELL_WIDTH
+
+    columns = math.ceil(math.sqrt(size))
+    rows = math.ceil(size / columns)
+    width = columns * (CELL_WIDTH + CELL_PADDING) - CELL_PADDING
+    height = rows * (round(GAME_IMAGE_SIZE[1] * CELL_WIDTH / GAME_IMAGE_SIZE[0]) + CELL_PADDING) - CELL_PADDING
+    return width * height * 4 / (1024 * 1024)
+
+
+def build_synthetic_atlas(root: str) -> dict:
+    """
+    Build the atlas of the synthetic games content into the atlas folder under a directory,
+    measuring the build like a page.
+    :param root: The directory the synthetic content was written to, and the working directory
+    :return: The build time, the bytes of the atlas image and the peak memory of the build
+    """
+    from atlas import ATLAS_FOLDER, build_atlas
+
+    # pillow keeps the pixels outside the python heap, so the decoded size of the atlas is reported too
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        atlas_map = build_atlas("games.json", atlas_folder=os.path.join(root, ATLAS_FOLDER))
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    decoded_mb = atlas_map["width"] * atlas_map["height"] * 4 / (1024 * 1024)
+    print(f"  atlas: {atlas_map['width']}x{atlas_map['height']} px, {decoded_mb:.0f} MB decoded", flush=True)
+    return {
+        "time_s": elapsed,
+        "elements": 0,
+        "element_bytes": 0,
+        "image_bytes": os.path.getsize(os.path.join(root, ATLAS_FOLDER, atlas_map["image"])),
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+# the pages to benchmark, these run as app test scripts so they import everything they use
+
+def _render_section(src_dir):
+    import sys
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from utils import load_json, show_section
+
+    data = load_json("games")
+    show_section(data["items"].items(), image_folder=data["image_folder"])
+
+
+def _render_portfolio(src_dir):
+    import sys
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from portfolio import show_portfolio
+
+    show_portfolio("games")
+
+
+def _render_certification(src_dir):
+    import sys
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    from certification import show_certification
+
+    show_certification()
+
+
+# the render function of each page, whether it runs with static serving so it uses the atlas,
+# and the content whose thumbnails the browser downloads as images besides the elements
+PAGES = {
+    "show_section": (_render_section, False, "games"),
+    "show_section_atlas": (_render_section, True, "games"),
+    "show_portfolio": (_render_portfolio, False, "games"),
+    "show_portfolio_atlas": (_render_portfolio, True, "games"),
+    # the certificates are inlined into the markdown as base64, so they are counted in the element bytes
+    "show_certification": (_render_certification, False, None),
+}
+
+ATLAS_PAGES = [name for name, (render, static_serving, content_name) in PAGES.items() if static_serving]
+
+
+def image_bytes(content_name: str, static_serving: bool) -> int:
+    """
+    Measure the bytes of the image files the browser downloads for the thumbnails of a content file,
+    the atlas image when it is used, otherwise the thumbnails, which st.image serves as they are on
+    disk when they are jpegs no wider than the page, and only once when they are identical.
+    :param content_name: Name of the content file, or None if the page downloads no images
+    :param static_serving: Whether the page ran with static serving, so it used the atlas
+    :return: The bytes of the image files
+    """
+    if content_name is None:
+        return 0
+
+    from atlas import ATLAS_FOLDER, read_atlas
+
+    with open(f"content/{content_name}.json", "r") as f:
+        data = json.load(f)
+    atlas = read_atlas(data["image_folder"]) if static_serving else None
+    if atlas:
+        return os.path.getsize(os.path.join(ATLAS_FOLDER, atlas["image"]))
+    thumbnails = set()
+    for key in data["items"]:
+        with open(f"{data['image_folder']}/{key}.jpg", "rb") as f:
+            thumbnails.add(f.read())
+    return sum(len(thumbnail) for thumbnail in thumbnails)
+
+
+def _run_page(render, static_serving: bool, timeout: float) -> AppTest:
+    # start every run with cold caches, so each size loads its own content
+    st.cache_data.clear()
+    config.set_option("server.enableStaticServing", static_serving)
+    at = AppTest.from_function(render, args=(SRC_DIR,), default_timeout=timeout).run()
+    if at.exception:
+        raise RuntimeError(f"{render.__name__} failed: {at.exception[0].message}")
+    return at
+
+
+def measure_page(render, static_serving=False, content_name=None, repeat=3, timeout=600.0) -> dict:
+    """
+    Render a page against the content in the working directory and measure it.
+    :param render: The render function of the page
+    :param static_serving: Whether to render with static serving enabled, so the atlas is used
+    :param content_name: The content whose thumbnails the page shows, or None
+    :param repeat: The number of timed runs, the fastest is reported
+    :param timeout: The maximum time of a single run in seconds
+    :return: The time, element count, payload bytes and peak memory of the page
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        at = _run_page(render, static_serving, timeout)
+        times.append(time.perf_counter() - started)
+
+    # count the elements, and the bytes of every element and container sent to the browser
+    elements = 0
+    element_bytes = 0
+    for node in at._tree:
+        proto = getattr(node, "proto", None)
+        if proto is not None:
+            element_bytes += proto.ByteSize()
+        if not isinstance(node, Block):
+            elements += 1
+
+    # memory is measured in its own run, as tracing slows the timed runs down
+    tracemalloc.start()
+    try:
+        _run_page(render, static_serving, timeout)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "time_s": min(times),
+        "elements": elements,
+        "element_bytes": element_bytes,
+        "image_bytes": image_bytes(content_name, static_serving),
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def run_benchmark(sizes=SIZES, pages=None, repeat=3, atlas_memory_mb=ATLAS_MEMORY_MB) -> list:
+    """
+    Render every page at every size, each against its own synthetic content.
+    :param sizes: The numbers of items to render
+    :param pages: The names of the pages to render, defaults to all of them
+    :param repeat: The number of timed runs per page and size
+    :param atlas_memory_mb: The largest atlas to build, the atlas pages are skipped at sizes that need more
+    :return: A list with a result row per page and size
+    """
+    results = []
+    cwd = os.getcwd()
+    pages = pages or list(PAGES)
+    previous_static_serving = config.get_option("server.enableStaticServing")
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"portfolio-benchmark-{size}-") as root:
+            generate_content(root, size)
+            os.chdir(root)
+            try:
+                # the atlas is a build step, so it is measured as a row of its own
+                size_pages = pages
+                if any(name in ATLAS_PAGES for name in pages):
+                    memory_mb = synthetic_atlas_memory_mb(size)
+                    if memory_mb > atlas_memory_mb:
+                        print(
+                            f"  build_atlas x {size}: skipped with the atlas pages, "
+                            f"needs {memory_mb:.0f} MB, above --atlas-memory-mb {atlas_memory_mb}",
+                            flush=True
+                        )
+                        size_pages = [name for name in pages if name not in ATLAS_PAGES]
+                    else:
+                        result = build_synthetic_atlas(root)
+                        results.append({"page": "build_atlas", "size": size, **result})
+                        print(f"  build_atlas x {size}: {result['time_s']:.2f}s", flush=True)
+
+                for name in size_pages:
+                    render, page_static_serving, content_name = PAGES[name]
+                    result = measure_page(render, page_static_serving, content_name, repeat=repeat)
+                    results.append({"page": name, "size": size, **result})
+                    print(f"  {name} x {size}: {result['time_s']:.2f}s", flush=True)
+            finally:
+                os.chdir(cwd)
+                config.set_option("server.enableStaticServing", previous_static_serving)
+    return results
+
+
+def print_scaling_curve(results: list):
+    """
+    Print the scaling curve of each page, with the growth of the render time between sizes.
+    A growth of 1.0 is linear in the number of items, higher is worse than linear.
+    :param results: The result rows of run_benchmark
+    """
+    header = f"{'size':>8} {'time (s)':>10} {'us/item':>10} {'growth':>8} {'elements':>10} {'element KB':>12} {'image KB':>10} {'peak MB':>9}"
+    for page in dict.fromkeys(row["page"] for row in results):
+        rows = sorted((row for row in results if row["page"] == page), key=lambda row: row["size"])
+        print(f"\n{page}")
+        print(header)
+        previous = None
+        for row in rows:
+            growth = ""
+            if previous and previous["time_s"] > 0:
+                factor = (row["time_s"] / previous["time_s"]) / (row["size"] / previous["size"])
+                growth = f"{factor:.2f}" + (" !" if factor > NON_LINEAR_GROWTH else "")
+            print(
+                f"{row['size']:>8} {row['time_s']:>10.3f} {row['time_s'] / row['size'] * 1e6:>10.1f} {growth:>8} "
+                f"{row['elements']:>10} {row['element_bytes'] / 1024:>12.1f} {row['image_bytes'] / 1024:>10.1f} {row['peak_mb']:>9.1f}"
+            )
+            previous = row
+    print(f"\ngrowth is the time ratio divided by the size ratio, ! marks growth above {NON_LINEAR_GROWTH}")
+
+
+def write_csv(results: list, path: str):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark how the pages scale with synthetic content.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--atlas-memory-mb", type=int, default=ATLAS_MEMORY_MB, help="Skip the atlas pages at sizes whose atlas needs more memory to build")
+    parser.add_argument("--output", help="Write the results to this csv file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.pages, args.repeat, args.atlas_memory_mb)
+    print_scaling_curve(results)
+    if args.output:
+        write_csv(results, args.output)
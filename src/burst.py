@@ -0,0 +1,130 @@
+"""
+Synthetic burst of visitors for testing the admission control gateway.
+
+This script opens many concurrent visitors against the gateway. Each visitor
+loads the page and its sidebar menu iframe and, unless it was served the static
+snapshot, opens a Streamlit session websocket and holds it for a while, as a
+real visitor would. Visitors can also reload the page, which must not use up
+more than one session slot each.
+
+All visitors connect from the same address, so by default a burst only tests the
+per-IP limit. With --distinct-ips every visitor sends its own X-Forwarded-For
+address, which reaches the global limit and queue when the gateway is run with
+--trust-forwarded-for.
+
+Run with:
+    python src/burst.py --port 8080 --visitors 200 --hold 20 --distinct-ips
+    python src/burst.py --port 8080 --visitors 1 --hold 1 --reloads 10
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import time
+from collections import Counter
+
+
+async def _request(host: str, port: int, head: str):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(head.encode("latin-1"))
+    await writer.drain()
+    response = await reader.readuntil(b"\r\n\r\n")
+    status = int(response.split(b" ", 2)[1])
+    return status, response.decode("latin-1").lower(), reader, writer
+
+
+OPTION_MENU_PATH = "/component/streamlit_option_menu.option_menu/index.html"
+
+
+async def load_page(host: str, port: int, forwarded_for: str, results: Counter, latencies: list):
+    """
+    Load the page as a browser does: the document, the sidebar menu component iframe, then the session websocket.
+    :param forwarded_for: The X-Forwarded-For address to send, or None to send none
+    :return: The writer of the session websocket, or None if no session was opened
+    """
+    forwarded = f"X-Forwarded-For: {forwarded_for}\r\n" if forwarded_for else ""
+    started = time.perf_counter()
+    status, headers, reader, writer = await _request(
+        host, port,
+        f"GET / HTTP/1.1\r\nHost: {host}:{port}\r\nAccept: text/html\r\nSec-Fetch-Dest: document\r\n{forwarded}Connection: close\r\n\r\n"
+    )
+    writer.close()
+    if "x-gateway: admission-control" in headers:
+        results["snapshot"] += 1
+        return None
+
+    # the menu iframe is html too, but it must not take a session slot or be answered with the snapshot
+    status, headers, reader, writer = await _request(
+        host, port,
+        f"GET {OPTION_MENU_PATH} HTTP/1.1\r\nHost: {host}:{port}\r\nAccept: text/html\r\nSec-Fetch-Dest: iframe\r\n{forwarded}Connection: close\r\n\r\n"
+    )
+    writer.close()
+    if "x-gateway: admission-control" in headers:
+        results["snapshot in menu iframe"] += 1
+
+    key = base64.b64encode(os.urandom(16)).decode()
+    status, headers, reader, writer = await _request(
+        host, port,
+        f"GET /_stcore/stream HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n{forwarded}\r\n"
+    )
+    if status != 101:
+        results[f"rejected ({status})"] += 1
+        writer.close()
+        return None
+
+    results["session"] += 1
+    latencies.append(time.perf_counter() - started)
+    return writer
+
+
+async def visitor(host: str, port: int, hold: float, reloads: int, forwarded_for: str, results: Counter, latencies: list):
+    """
+    Simulate a single visitor: load the page, hold the session open, and reload it a number of times.
+    """
+    try:
+        for _ in range(reloads + 1):
+            writer = await load_page(host, port, forwarded_for, results, latencies)
+            if writer is None:
+                return
+            await asyncio.sleep(hold)
+            writer.close()
+    except (ConnectionError, asyncio.IncompleteReadError) as e:
+        results[f"error ({type(e).__name__})"] += 1
+
+
+def _visitor_ip(index: int) -> str:
+    return f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+
+
+async def burst(host: str, port: int, visitors: int, hold: float, reloads: int = 0, distinct_ips: bool = False):
+    results = Counter()
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        visitor(host, port, hold, reloads, _visitor_ip(i) if distinct_ips else None, results, latencies)
+        for i in range(visitors)
+    ))
+
+    print(f"{visitors} visitors with {reloads} reloads each in {time.perf_counter() - started:.1f}s")
+    for outcome, count in sorted(results.items()):
+        print(f"  {outcome}: {count}")
+    if latencies:
+        latencies.sort()
+        print(f"  session admit latency p50: {latencies[len(latencies) // 2]:.2f}s, max: {latencies[-1]:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send a synthetic burst of visitors to the gateway.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--visitors", type=int, default=100)
+    parser.add_argument("--hold", type=float, default=10.0, help="Seconds each admitted visitor keeps its session open")
+    parser.add_argument("--reloads", type=int, default=0, help="Times each visitor reloads the page after holding its session")
+    parser.add_argument(
+        "--distinct-ips", action="store_true",
+        help="Send a different X-Forwarded-For address per visitor, for a gateway run with --trust-forwarded-for"
+    )
+    args = parser.parse_args()
+    asyncio.run(burst(args.host, args.port, args.visitors, args.hold, args.reloads, args.distinct_ips))
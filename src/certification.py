@@ -6,9 +6,8 @@ using Streamlit Antd Components for interactive visualization of certifications.
 """
 
 import streamlit as st
-import json
 import itertools
-from utils import load_image, st_image_link, st_horizontal
+from utils import load_image, load_json, st_image_link, st_horizontal
 
 
 def show_certification():
@@ -18,8 +17,7 @@ def show_certification():
     Renders a header for the certification section and creates a two-column layout
     with navigation menu in the left column and content in the right column.
     """
-    with open(f"content/certification.json", "r") as file:
-        data = json.load(file)
+    data = load_json("certification")
 
     page_title = data["title"]
     image_folder = data["image_folder"]
@@ -63,3 +61,14 @@ def show_certification():
             st.markdown("###### ")
             show_separator = True
 
+
+def prefetch_certification():
+    """
+    Warm the server-side caches of the certification section.
+    The certificates are inlined as base64, so there are no URLs for the browser to prefetch.
+    :return: The URLs of the assets to prefetch in the browser
+    """
+    data = load_json("certification")
+    for key in data["items"]:
+        load_image(key, data["image_folder"], extension="jpg")
+    return []
@@ -6,8 +6,7 @@ showcasing academic background and educational achievements.
 """
 
 import streamlit as st
-import json
-from utils import show_section
+from utils import load_json, show_section
 
 
 def show_education():
@@ -15,8 +14,7 @@ def show_education():
     Display the education section of the portfolio.
     """
     # Load education data from JSON file
-    with open(f"content/education.json", "r") as file:
-        data = json.load(file)
+    data = load_json("education")
 
     # Extract main and section titles
     main_title = data["main_title"]
@@ -0,0 +1,307 @@
+"""
+Admission control gateway for the Streamlit application.
+
+This script runs a small reverse proxy in front of `streamlit run src/app.py`.
+Every Streamlit script session is a websocket to /_stcore/stream, so the
+gateway counts those websockets and limits them globally and per client IP.
+A page load reserves a slot for the session it is about to open, waiting in a
+bounded queue when there is none; when no slot frees up before the timeout,
+the page load is answered with a pre-rendered static snapshot of the site
+instead of starting another session.
+
+Run with:
+    streamlit run src/app.py --server.port 8501
+    python src/gateway.py --port 8080 --upstream-port 8501
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from service_worker import SERVICE_WORKER_ENABLED, SERVICE_WORKER_PATH, SNAPSHOT_PATH, content_mtimes, render_service_worker
+from snapshot import render_snapshot
+
+
+STREAM_PATH = "/_stcore/stream"
+
+# html under these paths is loaded by the page itself, such as component iframes, so it is not a page load
+NON_PAGE_PREFIXES = ("/component/", "/app/static/", "/static/", "/media/", "/_stcore/")
+MAX_HEADER_BYTES = 64 * 1024
+PIPE_CHUNK_BYTES = 64 * 1024
+
+
+class AdmissionController:
+    """
+    Tracks the active sessions, the slots reserved by page loads whose session
+    has not connected yet, and the queue of visitors waiting for a slot.
+    """
+
+    def __init__(self, max_sessions=50, max_sessions_per_ip=5, queue_size=20, queue_timeout=10.0, reservation_timeout=30.0):
+        self.max_sessions = max_sessions
+        self.max_sessions_per_ip = max_sessions_per_ip
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.reservation_timeout = reservation_timeout
+        self.active = 0
+        self.active_per_ip = {}
+        self.reservations = {}
+        self.waiting = 0
+        self.condition = asyncio.Condition()
+
+    def _expire_reservations(self):
+        now = time.monotonic()
+        for ip in list(self.reservations):
+            self.reservations[ip] = [expiry for expiry in self.reservations[ip] if expiry > now]
+            if not self.reservations[ip]:
+                del self.reservations[ip]
+
+    def has_capacity(self, ip: str) -> bool:
+        """
+        Check if a new session from the given IP would be admitted right now.
+        :param ip: The client IP address
+        :return: True if there is a free slot for the IP
+        """
+        self._expire_reservations()
+        reserved = sum(len(expiries) for expiries in self.reservations.values())
+        used_by_ip = self.active_per_ip.get(ip, 0) + len(self.reservations.get(ip, []))
+        return self.active + reserved < self.max_sessions and used_by_ip < self.max_sessions_per_ip
+
+    async def _wait_for_capacity(self, ip: str, timeout: float) -> bool:
+        # must be called with the condition held
+        if self.has_capacity(ip):
+            return True
+        if self.waiting >= self.queue_size:
+            return False
+
+        # reservations expire without a notify, so re-check the capacity at least twice a second
+        self.waiting += 1
+        try:
+            deadline = time.monotonic() + timeout
+            while not self.has_capacity(ip):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(self.condition.wait(), min(remaining, 0.5))
+                except asyncio.TimeoutError:
+                    pass
+            return True
+        finally:
+            self.waiting -= 1
+
+    async def reserve(self, ip: str, timeout=None) -> bool:
+        """
+        Wait in the queue for a free slot and reserve it for the session the page load will open.
+        :param ip: The client IP address
+        :param timeout: The maximum time to wait, defaults to the queue timeout
+        :return: True if a slot was reserved, False if the queue is full or timed out
+        """
+        async with self.condition:
+            if not await self._wait_for_capacity(ip, self.queue_timeout if timeout is None else timeout):
+                return False
+            self.reservations.setdefault(ip, []).append(time.monotonic() + self.reservation_timeout)
+            return True
+
+    async def acquire(self, ip: str, timeout=None) -> bool:
+        """
+        Take a slot for a new session, using a reservation from the IP if there is one,
+        otherwise waiting in the queue for a free slot.
+        :param ip: The client IP address
+        :param timeout: The maximum time to wait, defaults to the queue timeout
+        :return: True if the session was admitted, False otherwise
+        """
+        async with self.condition:
+            self._expire_reservations()
+            if self.reservations.get(ip):
+                self.reservations[ip].pop(0)
+                if not self.reservations[ip]:
+                    del self.reservations[ip]
+            elif not await self._wait_for_capacity(ip, self.queue_timeout if timeout is None else timeout):
+                return False
+            self.active += 1
+            self.active_per_ip[ip] = self.active_per_ip.get(ip, 0) + 1
+            return True
+
+    async def release(self, ip: str):
+        """
+        Release the slot of a session that has ended, and wake up the queue.
+        :param ip: The client IP address
+        """
+        async with self.condition:
+            self.active -= 1
+            self.active_per_ip[ip] -= 1
+            if self.active_per_ip[ip] == 0:
+                del self.active_per_ip[ip]
+            self.condition.notify_all()
+
+
+class Gateway:
+    """
+    The reverse proxy that applies admission control to new Streamlit sessions.
+    """
+
+    def __init__(self, admission: AdmissionController, upstream_host="127.0.0.1", upstream_port=8501, trust_forwarded_for=False, service_worker=False):
+        self.admission = admission
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self.trust_forwarded_for = trust_forwarded_for
+        self.service_worker_enabled = service_worker
+        self.content_mtimes = None
+        self.snapshot = None
+        self.service_worker = None
+        self._refresh()
+
+    def _refresh(self):
+        # the snapshot and the cache version of the worker come from content/ and images/,
+        # so render them again when a file in them changes
+        mtimes = content_mtimes()
+        if mtimes == self.content_mtimes:
+            return
+        self.content_mtimes = mtimes
+        self.snapshot = render_snapshot().encode()
+        self.service_worker = render_service_worker().encode() if self.service_worker_enabled else None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+
+        method, path, headers = self._parse_head(head)
+        ip = self._client_ip(writer, headers)
+
+        try:
+            if path.split("?")[0].endswith(STREAM_PATH) and headers.get("upgrade", "").lower() == "websocket":
+                # a websocket to the stream is a new script session, so it needs a slot
+                if not await self.admission.acquire(ip):
+                    await self._respond(writer, 503, "text/plain", b"Server is over capacity", {"Retry-After": "10"})
+                    return
+                try:
+                    await self._proxy(head, reader, writer)
+                finally:
+                    await self.admission.release(ip)
+
+            elif method == "GET" and self.service_worker_enabled and path.split("?")[0] == SERVICE_WORKER_PATH:
+                # the worker is served from the root so its scope covers the whole site
+                self._refresh()
+                await self._respond(writer, 200, "application/javascript", self.service_worker, {"Cache-Control": "no-cache", "Service-Worker-Allowed": "/"})
+
+            elif method == "GET" and self.service_worker_enabled and path.split("?")[0] == SNAPSHOT_PATH:
+                # the snapshot is precached by the worker and shown when the visitor is offline
+                self._refresh()
+                await self._respond(writer, 200, "text/html; charset=utf-8", self.snapshot, {"Cache-Control": "no-cache"})
+
+            elif self._is_page_load(method, path, headers):
+                # a page load will start a new session, so serve the snapshot if no slot frees up
+                if not await self.admission.reserve(ip):
+                    self._refresh()
+                    await self._respond(writer, 200, "text/html; charset=utf-8", self.snapshot, {"Cache-Control": "no-store"})
+                    return
+                await self._proxy(self._close_after_response(head), reader, writer)
+
+            else:
+                await self._proxy(self._close_after_response(head), reader, writer)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _parse_head(self, head: bytes):
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split(" ")
+        method, path = (parts[0], parts[1]) if len(parts) >= 2 else ("", "")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        return method, path, headers
+
+    def _is_page_load(self, method: str, path: str, headers: dict) -> bool:
+        if method != "GET":
+            return False
+        # browsers say when a request is a top-level navigation, rather than an iframe or a fetch
+        if "sec-fetch-dest" in headers:
+            return headers["sec-fetch-dest"] == "document"
+        return "text/html" in headers.get("accept", "") and not path.startswith(NON_PAGE_PREFIXES)
+
+    def _close_after_response(self, head: bytes) -> bytes:
+        # only the first request on a connection is classified, so have the upstream close the
+        # connection after its response, and every later request arrives on a new connection
+        lines = head.decode("latin-1").split("\r\n")
+        lines = [line for line in lines[:-2] if line.split(":", 1)[0].strip().lower() not in ("connection", "keep-alive")]
+        lines += ["Connection: close", "", ""]
+        return "\r\n".join(lines).encode("latin-1")
+
+    def _client_ip(self, writer: asyncio.StreamWriter, headers: dict) -> str:
+        # behind a router such as heroku's the real client is the first forwarded address
+        if self.trust_forwarded_for and "x-forwarded-for" in headers:
+            return headers["x-forwarded-for"].split(",")[0].strip()
+        peer = writer.get_extra_info("peername")
+        return peer[0] if peer else ""
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, content_type: str, body: bytes, extra_headers=None):
+        reasons = {200: "OK", 503: "Service Unavailable"}
+        lines = [
+            f"HTTP/1.1 {status} {reasons[status]}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+            "X-Gateway: admission-control",
+        ]
+        for name, value in (extra_headers or {}).items():
+            lines.append(f"{name}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def _proxy(self, head: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        upstream_reader, upstream_writer = await asyncio.open_connection(self.upstream_host, self.upstream_port)
+        upstream_writer.write(head)
+        await upstream_writer.drain()
+
+        async def pipe(source: asyncio.StreamReader, target: asyncio.StreamWriter):
+            try:
+                while chunk := await source.read(PIPE_CHUNK_BYTES):
+                    target.write(chunk)
+                    await target.drain()
+            except ConnectionError:
+                pass
+            finally:
+                target.close()
+
+        await asyncio.gather(pipe(reader, upstream_writer), pipe(upstream_reader, writer))
+
+
+async def serve(gateway: Gateway, host: str, port: int):
+    server = await asyncio.start_server(gateway.handle, host, port, limit=MAX_HEADER_BYTES)
+    async with server:
+        await server.serve_forever()
+
+
+def parse_args(argv=None):
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description="Admission control gateway for the portfolio website.")
+    parser.add_argument("--host", default=env("GATEWAY_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(env("PORT", 8080)))
+    parser.add_argument("--upstream-host", default=env("GATEWAY_UPSTREAM_HOST", "127.0.0.1"))
+    parser.add_argument("--upstream-port", type=int, default=int(env("GATEWAY_UPSTREAM_PORT", 8501)))
+    parser.add_argument("--max-sessions", type=int, default=int(env("GATEWAY_MAX_SESSIONS", 50)))
+    parser.add_argument("--max-sessions-per-ip", type=int, default=int(env("GATEWAY_MAX_SESSIONS_PER_IP", 5)))
+    parser.add_argument("--queue-size", type=int, default=int(env("GATEWAY_QUEUE_SIZE", 20)))
+    parser.add_argument("--queue-timeout", type=float, default=float(env("GATEWAY_QUEUE_TIMEOUT", 10)))
+    parser.add_argument("--reservation-timeout", type=float, default=float(env("GATEWAY_RESERVATION_TIMEOUT", 30)))
+    parser.add_argument("--service-worker", action="store_true", default=SERVICE_WORKER_ENABLED)
+    parser.add_argument("--trust-forwarded-for", action="store_true", default=env("GATEWAY_TRUST_FORWARDED_FOR") == "1")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    admission = AdmissionController(
+        args.max_sessions, args.max_sessions_per_ip, args.queue_size, args.queue_timeout, args.reservation_timeout
+    )
+    gateway = Gateway(admission, args.upstream_host, args.upstream_port, args.trust_forwarded_for, args.service_worker)
+    print(f"Gateway listening on {args.host}:{args.port}, forwarding to {args.upstream_host}:{args.upstream_port}")
+    asyncio.run(serve(gateway, args.host, args.port))
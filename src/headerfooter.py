@@ -42,3 +42,154 @@ footer_with_name = """
     </p>
 </div>
 """
+
+telemetry_script = """
+<script>
+(function () {
+    // this runs inside the component iframe, so measure the streamlit page that hosts it
+    const host = window.parent;
+    const perf = host.performance;
+    const page = {page};
+
+    // the collector only listens on plain HTTP, which an HTTPS page is not allowed to post to
+    if (host.location.protocol !== "http:") {
+        return;
+    }
+    const endpoint = host.location.protocol + "//" + host.location.hostname + ":{port}/rum";
+
+    // state is kept on the host window so it survives the reruns between pages
+    const state = host.__rum || (host.__rum = { navigationSent: false, lcp: null, imageMark: 0 });
+
+    function updateLcp(entries) {
+        if (entries.length > 0) {
+            state.lcp = entries[entries.length - 1].startTime;
+        }
+    }
+
+    if (!state.observer && "PerformanceObserver" in host) {
+        try {
+            state.observer = new host.PerformanceObserver(function (list) {
+                updateLcp(list.getEntries());
+            });
+            state.observer.observe({ type: "largest-contentful-paint", buffered: true });
+        } catch (e) {
+            state.observer = true;
+        }
+    }
+
+    // thumbnails are css background views into an atlas image, which are not in document.images
+    function backgroundImageUrls() {
+        const urls = [];
+        host.document.querySelectorAll('[style*="background-image"]').forEach(function (element) {
+            const match = /url\\(["']?([^"')]+)["']?\\)/.exec(element.style.backgroundImage);
+            if (match) {
+                urls.push(new URL(match[1], host.location.href).href);
+            }
+        });
+        return urls;
+    }
+
+    function imagesLoaded() {
+        const loaded = perf.getEntriesByType("resource").map(function (entry) { return entry.name; });
+        return Array.from(host.document.images).every(function (img) { return img.complete; })
+            && backgroundImageUrls().every(function (url) { return loaded.indexOf(url) >= 0; });
+    }
+
+    function isImage(entry) {
+        // css entries are also fonts and stylesheets, so only count the ones that are images
+        return entry.initiatorType === "img"
+            || (entry.initiatorType === "css" && /\\.(jpe?g|png|gif|webp|svg)(\\?|$)/.test(entry.name));
+    }
+
+    function report() {
+        const data = { page: page };
+
+        // navigation timing and LCP only describe the first load of the page
+        if (!state.navigationSent) {
+            const nav = perf.getEntriesByType("navigation")[0];
+            if (nav) {
+                data.navigation = {
+                    ttfb: nav.responseStart - nav.startTime,
+                    dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+                    load: nav.loadEventEnd - nav.startTime
+                };
+            }
+            // the observer callback runs in a later task, so take the entries it has not delivered yet
+            if (state.observer && state.observer.takeRecords) {
+                updateLcp(state.observer.takeRecords());
+            }
+            data.lcp = state.lcp;
+            state.navigationSent = true;
+        }
+
+        // image timings since the previous report, so each page only reports its own images
+        const images = perf.getEntriesByType("resource").filter(function (entry) {
+            return isImage(entry) && entry.startTime >= state.imageMark;
+        });
+        data.images = images.map(function (entry) { return entry.duration; });
+        if (images.length > 0) {
+            const start = Math.min.apply(null, images.map(function (entry) { return entry.startTime; }));
+            const end = Math.max.apply(null, images.map(function (entry) { return entry.responseEnd; }));
+            data.images_complete = end - start;
+        }
+        state.imageMark = perf.now();
+
+        const body = new Blob([JSON.stringify(data)], { type: "text/plain" });
+        if (!(navigator.sendBeacon && navigator.sendBeacon(endpoint, body))) {
+            fetch(endpoint, { method: "POST", body: body, mode: "no-cors", keepalive: true });
+        }
+    }
+
+    // wait for the page images to finish loading, but give up after 10 seconds
+    const started = Date.now();
+    (function waitForImages() {
+        if (imagesLoaded() || Date.now() - started > 10000) {
+            report();
+        } else {
+            setTimeout(waitForImages, 250);
+        }
+    })();
+})();
+</script>
+"""
+
+prefetch_script = """
+<script>
+(function () {
+    // this runs inside the component iframe, so add the hints to the streamlit page that hosts it
+    const host = window.parent;
+    const urls = {urls};
+
+    function prefetch() {
+        urls.forEach(function (url) {
+            const href = new URL(url, host.location.href).href;
+            if (!host.document.querySelector('link[rel="prefetch"][href="' + href + '"]')) {
+                const link = host.document.createElement("link");
+                link.rel = "prefetch";
+                link.href = href;
+                host.document.head.appendChild(link);
+            }
+        });
+    }
+
+    // wait until the browser is idle after rendering the current page
+    if ("requestIdleCallback" in host) {
+        host.requestIdleCallback(prefetch, { timeout: 5000 });
+    } else {
+        host.setTimeout(prefetch, 2000);
+    }
+})();
+</script>
+"""
+
+service_worker_script = """
+<script>
+(function () {
+    // this runs inside the component iframe, so register the worker for the streamlit page that hosts it
+    const host = window.parent;
+    if ("serviceWorker" in host.navigator) {
+        host.navigator.serviceWorker.register({path}, { scope: "/" });
+    }
+})();
+</script>
+"""
@@ -6,25 +6,44 @@ showcasing professional experience and career trajectory.
 """
 
 import streamlit as st
-import json
 import itertools
-from utils import show_section
+from utils import load_json, show_section
+from atlas import load_atlas, atlas_url
 
 
 def show_games():
-    show_portfolio("games.json")
+    show_portfolio("games")
 
 
 def show_simulation():
-    show_portfolio("simulation.json")
+    show_portfolio("simulation")
 
 
-def show_portfolio(json_filename):
+def prefetch_games():
+    return prefetch_portfolio("games")
+
+
+def prefetch_simulation():
+    return prefetch_portfolio("simulation")
+
+
+def prefetch_portfolio(content_name):
+    """
+    Warm the server-side caches of a portfolio section.
+    :return: The URLs of the assets to prefetch in the browser
+    """
+    data = load_json(content_name)
+    atlas = load_atlas(data["image_folder"])
+    if atlas:
+        return [atlas_url(atlas)]
+    return []
+
+
+def show_portfolio(content_name):
     """
     Display the job history section of the portfolio.    
     """
-    with open(f"content/{json_filename}", "r") as file:
-        data = json.load(file)
+    data = load_json(content_name)
 
     main_title = data["title"]
     image_folder = data["image_folder"]
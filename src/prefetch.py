@@ -0,0 +1,28 @@
+"""
+Predictive prefetch for the Streamlit application.
+
+This module warms the server-side caches of the pages the visitor is likely to
+open next, and hints the browser to prefetch their assets while it is idle
+after the current page renders.
+"""
+
+import json
+
+import streamlit.components.v1 as components
+
+from headerfooter import prefetch_script
+
+
+def show_prefetch(prefetch_funcs):
+    """
+    Prefetch the content and assets of the likely next pages.
+    :param prefetch_funcs: The prefetch_xxx functions of the likely next pages
+    """
+    urls = []
+    for prefetch_func in prefetch_funcs or []:
+        for url in prefetch_func():
+            if url not in urls:
+                urls.append(url)
+
+    if urls:
+        components.html(prefetch_script.replace("{urls}", json.dumps(urls)), height=0)
@@ -0,0 +1,191 @@
+"""
+Service worker for repeat visitors of the portfolio website.
+
+This module renders an optional service worker that precaches the fingerprinted
+static assets of the site and serves them cache-first, so repeat visits load
+most page bytes from the local cache. The cache is versioned by a hash of the
+content/ and images/ folders and the atlases, so it is replaced whenever they change.
+
+Streamlit can only serve files under /app/static/, which is too narrow a scope
+to control the page, so the service worker is served at /sw.js by the gateway:
+    SERVICE_WORKER=1 streamlit run src/app.py --server.port 8501 --server.enableStaticServing true
+    SERVICE_WORKER=1 python src/gateway.py --port 8080 --upstream-port 8501
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import streamlit
+import streamlit.components.v1 as components
+
+from atlas import ATLAS_CONTENT, ATLAS_FOLDER, atlas_url, read_atlas
+from headerfooter import service_worker_script
+
+
+# the service worker is only registered and served when this is set to 1
+SERVICE_WORKER_ENABLED = os.environ.get("SERVICE_WORKER") == "1"
+
+SERVICE_WORKER_PATH = "/sw.js"
+SNAPSHOT_PATH = "/snapshot.html"
+
+# the folders whose content is cached, a change to any file in them creates a new cache version
+VERSIONED_FOLDERS = ["content", "images", ATLAS_FOLDER]
+
+
+SERVICE_WORKER_JS = """
+const CACHE_PREFIX = "portfolio-";
+const CACHE_NAME = CACHE_PREFIX + "{version}";
+const PRECACHE_URLS = {precache_urls};
+const OPTIONAL_PRECACHE_URLS = {optional_precache_urls};
+const OFFLINE_URL = "{offline_url}";
+
+// the optional urls are added one by one, so one that fails does not stop the worker installing
+self.addEventListener("install", function (event) {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(function (cache) {
+                return cache.addAll(PRECACHE_URLS).then(function () {
+                    return Promise.all(OPTIONAL_PRECACHE_URLS.map(function (url) {
+                        return cache.add(url).catch(function (error) {
+                            console.warn("Service worker could not precache " + url, error);
+                        });
+                    }));
+                });
+            })
+            .then(function () { return self.skipWaiting(); })
+    );
+});
+
+// remove the caches of every other version once this one is active
+self.addEventListener("activate", function (event) {
+    event.waitUntil(
+        caches.keys()
+            .then(function (keys) {
+                return Promise.all(keys.filter(function (key) {
+                    return key.startsWith(CACHE_PREFIX) && key !== CACHE_NAME;
+                }).map(function (key) { return caches.delete(key); }));
+            })
+            .then(function () { return self.clients.claim(); })
+    );
+});
+
+// fingerprinted urls never change, so they are safe to serve from the cache first
+function isFingerprinted(url) {
+    return url.pathname.startsWith("/static/")
+        || url.pathname.startsWith("/media/")
+        || (url.pathname.startsWith("/app/static/") && url.searchParams.has("v"));
+}
+
+self.addEventListener("fetch", function (event) {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== "GET" || url.origin !== self.location.origin) {
+        return;
+    }
+
+    if (isFingerprinted(url)) {
+        event.respondWith(
+            caches.open(CACHE_NAME).then(function (cache) {
+                return cache.match(request).then(function (cached) {
+                    return cached || fetch(request).then(function (response) {
+                        if (response.ok) {
+                            cache.put(request, response.clone());
+                        }
+                        return response;
+                    });
+                });
+            })
+        );
+    } else if (request.mode === "navigate") {
+        // the page itself always comes from the network, with the static snapshot when offline
+        event.respondWith(
+            fetch(request).catch(function () {
+                return caches.match(OFFLINE_URL);
+            })
+        );
+    }
+});
+"""
+
+
+def _streamlit_bundle_urls() -> list:
+    """
+    Find the fingerprinted javascript and css bundle that the streamlit index page loads.
+    :return: The URLs of the bundle
+    """
+    index_path = os.path.join(os.path.dirname(streamlit.__file__), "static", "index.html")
+    with open(index_path, "r") as f:
+        index_html = f.read()
+    return [f"/{path}" for path in re.findall(r"(?:src|href)=\"\./(static/[^\"]+)\"", index_html)]
+
+
+def _atlas_urls() -> list:
+    urls = []
+    for json_filename in ATLAS_CONTENT:
+        with open(f"content/{json_filename}", "r") as file:
+            data = json.load(file)
+        atlas = read_atlas(data["image_folder"])
+        if atlas:
+            urls.append(f"/{atlas_url(atlas)}")
+    return urls
+
+
+def _versioned_files():
+    for folder in VERSIONED_FOLDERS:
+        for root, dirs, files in sorted(os.walk(folder)):
+            dirs.sort()
+            for filename in sorted(files):
+                yield folder, os.path.join(root, filename)
+
+
+def content_mtimes() -> tuple:
+    """
+    Stat the files of the versioned folders, a cheap way to tell if the cache version may have changed.
+    :return: The path, modification time and size of every file
+    """
+    result = []
+    for folder, path in _versioned_files():
+        stat = os.stat(path)
+        result.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(result)
+
+
+def cache_version() -> str:
+    """
+    Hash the files of the versioned folders, and the streamlit version whose bundle is cached.
+    :return: The cache version
+    """
+    digest = hashlib.sha256(streamlit.__version__.encode())
+    for folder, path in _versioned_files():
+        digest.update(os.path.relpath(path, folder).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def render_service_worker() -> str:
+    """
+    Render the service worker with the current cache version and precache list.
+    :return: The javascript of the service worker
+    """
+    # the atlases are only served when streamlit static serving is enabled, so they are optional
+    precache_urls = _streamlit_bundle_urls() + [SNAPSHOT_PATH]
+    return (
+        SERVICE_WORKER_JS
+        .replace("{version}", cache_version())
+        .replace("{precache_urls}", json.dumps(precache_urls))
+        .replace("{optional_precache_urls}", json.dumps(_atlas_urls()))
+        .replace("{offline_url}", SNAPSHOT_PATH)
+    )
+
+
+def show_service_worker():
+    """
+    Register the service worker in the visitor's browser, when it is enabled.
+    """
+    if not SERVICE_WORKER_ENABLED:
+        return
+
+    components.html(service_worker_script.replace("{path}", json.dumps(SERVICE_WORKER_PATH)), height=0)
@@ -12,8 +12,8 @@ from social_media import SocialMediaIcons
 from utils import load_image
 
 from aboutme import show_aboutme
-from certification import show_certification
-from portfolio import show_simulation, show_games
+from certification import show_certification, prefetch_certification
+from portfolio import show_simulation, show_games, prefetch_simulation, prefetch_games
 from education import show_education
 from genai_projects import show_genai_projects
 from work_history import show_work_history
@@ -63,6 +63,20 @@ def show_sidebar():
 #        "Gen AI Projects": show_genai_projects,
     }
 
+    # create the dictionary of navigation menu names and prefetch_xxx functions
+    nav_prefetch = {
+        "Game Development": prefetch_games,
+        "Simulator Development": prefetch_simulation,
+        "AI/ML Certifications": prefetch_certification,
+    }
+
+    # the pages a visitor is likely to open next from each page, the other pages prefetch nothing
+    nav_likely_next = {
+        "Game Development": ["Simulator Development", "AI/ML Certifications"],
+        "Simulator Development": ["Game Development", "AI/ML Certifications"],
+        "AI/ML Certifications": ["Game Development", "Simulator Development"],
+    }
+
     nav_icons=[
         'person-fill',
         'controller', 
@@ -116,6 +130,14 @@ def show_sidebar():
         social_media_icons.render()
 
 
+    # remember the selected page name and all page names, used to label the page telemetry
+    st.session_state["selected_page"] = nav_tab_op
+    st.session_state["nav_pages"] = list(nav_funcs.keys())
+
+    # prefetch the pages that are likely to be opened next from the selected one
+    likely_pages = nav_likely_next.get(nav_tab_op, [])
+    st.session_state["prefetch_funcs"] = [nav_prefetch[page] for page in likely_pages]
+
     # return the show_xxx function for the selected page
     for key, value in nav_funcs.items():
         if nav_tab_op == key:
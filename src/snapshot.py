@@ -0,0 +1,199 @@
+"""
+Static snapshot of the portfolio website.
+
+This module pre-renders the content of every page into a single static HTML
+document, which the gateway serves instead of starting a new Streamlit session
+when the server is over capacity.
+"""
+
+import html
+import json
+import re
+import sys
+
+
+SNAPSHOT_STYLE = """
+<style>
+    body { background-color: rgb(14 17 23); color: rgb(250 250 250); font-family: sans-serif; margin: 0; }
+    nav { background-color: rgb(38 39 48); padding: 12px 24px; position: sticky; top: 0; }
+    nav a { color: wheat; margin-right: 20px; text-decoration: none; }
+    main { max-width: 1100px; margin: auto; padding: 0 24px 48px 24px; }
+    section { border: 1px solid rgb(60 61 70); border-radius: 8px; margin-top: 24px; padding: 8px 24px; }
+    a { color: wheat; }
+    .notice { background-color: darkred; padding: 12px 24px; text-align: center; }
+</style>
+"""
+
+
+def _inline_markdown(text: str) -> str:
+    """
+    Convert the inline markdown used in the content files to HTML.
+    :param text: A single line of markdown
+    :return: The HTML for the line
+    """
+    text = html.escape(text.strip(), quote=False)
+    text = text.replace("\\*", "&#42;")
+    text = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+    text = re.sub(r"\*(.+?)\*", r"<em>\1</em>", text)
+    return text
+
+
+def markdown_to_html(md: str) -> str:
+    """
+    Convert the subset of markdown used in the content files to HTML.
+    Supports headings, paragraphs, nested bullet lists, bold and italic text.
+    :param md: The markdown content
+    :return: The HTML content
+    """
+    lines = []
+    list_indents = []
+    paragraph = []
+
+    def close_paragraph():
+        if paragraph:
+            lines.append(f"<p>{' '.join(paragraph)}</p>")
+            paragraph.clear()
+
+    def close_lists(indent=-1):
+        while list_indents and list_indents[-1] > indent:
+            lines.append("</li></ul>")
+            list_indents.pop()
+
+    for line in md.splitlines():
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+        heading = re.match(r"(#{1,6})\s+(.*)", stripped)
+        bullet = re.match(r"[-*]\s+(.*)", stripped)
+
+        if not stripped:
+            close_paragraph()
+        elif heading:
+            close_paragraph()
+            close_lists()
+            level = len(heading.group(1))
+            lines.append(f"<h{level}>{_inline_markdown(heading.group(2))}</h{level}>")
+        elif bullet:
+            close_paragraph()
+            close_lists(indent)
+            if list_indents and list_indents[-1] == indent:
+                lines.append("</li>")
+            else:
+                lines.append("<ul>")
+                list_indents.append(indent)
+            lines.append(f"<li>{_inline_markdown(bullet.group(1))}")
+        else:
+            if not list_indents:
+                paragraph.append(_inline_markdown(stripped))
+            else:
+                lines.append(_inline_markdown(stripped))
+
+    close_paragraph()
+    close_lists()
+    return "\n".join(lines)
+
+
+def _section_html(section: dict) -> str:
+    """
+    Render the items of a section, the static equivalent of utils.show_section.
+    :param section: A dictionary of items with a title, optional subtitle and lines
+    :return: The HTML for the section
+    """
+    parts = []
+    for item in section.values():
+        parts.append(f"<h4>{html.escape(item['title'])}</h4>")
+        if "subtitle" in item:
+            parts.append(f"<h5>{html.escape(item['subtitle'])}</h5>")
+
+        details = []
+        line_number = 1
+        while f"line{line_number}" in item:
+            details.append(f"<li>{_inline_markdown(item[f'line{line_number}'])}</li>")
+            line_number += 1
+        if details:
+            parts.append(f"<ul>{''.join(details)}</ul>")
+    return "\n".join(parts)
+
+
+def _load_json(json_filename: str) -> dict:
+    with open(f"content/{json_filename}", "r") as file:
+        return json.load(file)
+
+
+def _aboutme_html() -> str:
+    with open("content/about_me.md", "r") as f:
+        return "<h2>About Me</h2>\n" + markdown_to_html(f.read())
+
+
+def _portfolio_html(json_filename: str) -> str:
+    data = _load_json(json_filename)
+    return f"<h2>{html.escape(data['title'])}</h2>\n" + _section_html(data["items"])
+
+
+def _two_column_html(json_filename: str) -> str:
+    data = _load_json(json_filename)
+    return "\n".join([
+        f"<h2>{html.escape(data['main_title'])}</h2>",
+        _section_html(data["main"]),
+        f"<h2>{html.escape(data['other_title'])}</h2>",
+        _section_html(data["other"]),
+    ])
+
+
+def _certification_html() -> str:
+    data = _load_json("certification.json")
+    parts = [f"<h2>{html.escape(data['title'])}</h2>"]
+    for item in data["items"].values():
+        parts.append(f"<h3>{html.escape(item['org'])}</h3>")
+        parts.append(f"<p><a href=\"{html.escape(item['certificate_link'])}\" target=\"_blank\">{html.escape(item['title'])}</a></p>")
+    return "\n".join(parts)
+
+
+# the pages of the snapshot, in the same order as the sidebar navigation
+SNAPSHOT_PAGES = {
+    "About Me": _aboutme_html,
+    "Game Development": lambda: _portfolio_html("games.json"),
+    "Simulator Development": lambda: _portfolio_html("simulation.json"),
+    "Work History": lambda: _two_column_html("work_history.json"),
+    "AI/ML Certifications": _certification_html,
+    "Education": lambda: _two_column_html("education.json"),
+}
+
+
+def render_snapshot() -> str:
+    """
+    Render every page of the portfolio into a single static HTML document.
+    :return: The HTML document
+    """
+    anchors = {name: re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") for name in SNAPSHOT_PAGES}
+    nav = " ".join(f"<a href=\"#{anchors[name]}\">{html.escape(name)}</a>" for name in SNAPSHOT_PAGES)
+    sections = "\n".join(
+        f"<section id=\"{anchors[name]}\">\n{render()}\n</section>" for name, render in SNAPSHOT_PAGES.items()
+    )
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Michael Petrou - Portfolio</title>
+{SNAPSHOT_STYLE}
+</head>
+<body>
+<div class="notice">The site is busy right now, so this is a static copy. <a href="/">Try the full site again</a>.</div>
+<nav>{nav}</nav>
+<main>
+{sections}
+</main>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    # write the snapshot to a file (or stdout) so it can be inspected in a browser
+    snapshot = render_snapshot()
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w") as f:
+            f.write(snapshot)
+    else:
+        print(snapshot)
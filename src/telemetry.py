@@ -0,0 +1,225 @@
+"""
+Real-user performance telemetry for the Streamlit application.
+
+This module contains a small collector that receives Navigation Timing, LCP and
+image-load timings reported by the visitor's browser, aggregates them into
+percentiles per page and writes the summary to disk. The collector is optional
+and only runs when the RUM_COLLECTOR_PORT environment variable is set.
+
+The browser posts to the collector port over plain HTTP, so it only receives
+reports from pages that are served over HTTP too, such as local or self-hosted runs.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from headerfooter import telemetry_script
+
+
+logger = logging.getLogger(__name__)
+
+# the port the collector listens on, telemetry is disabled when this is not set
+COLLECTOR_PORT = os.environ.get("RUM_COLLECTOR_PORT")
+
+# the file the aggregated percentiles are written to
+COLLECTOR_OUTPUT = os.environ.get("RUM_COLLECTOR_OUTPUT", "telemetry/rum.json")
+
+# limits to stop a misbehaving client from growing the collector without bound
+MAX_SAMPLES = 1000
+MAX_BODY_BYTES = 64 * 1024
+
+# how often the summary is written to disk, in seconds
+FLUSH_INTERVAL = 10
+
+NAVIGATION_METRICS = ("ttfb", "dom_content_loaded", "load")
+
+PERCENTILES = (50, 75, 95)
+
+
+def percentile(samples, p: float) -> float:
+    """
+    Calculate a percentile using the nearest-rank method.
+    :param samples: The samples to calculate the percentile of
+    :param p: The percentile to calculate (0 - 100)
+    :return: The value at the percentile, or None if there are no samples
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def is_sample(value) -> bool:
+    """
+    Check that a reported value is a usable timing, bool is an int in python so it is rejected explicitly.
+    :param value: The value from the report
+    :return: True if the value is a finite, non-negative number
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value) and value >= 0
+
+
+class RumCollector:
+    """
+    Aggregates timing reports from the browser into percentiles per page.
+    Reports only update the samples, the summary is written to disk by a flush timer.
+    """
+
+    def __init__(self, output_path=COLLECTOR_OUTPUT, max_samples=MAX_SAMPLES, pages=()):
+        self.output_path = output_path
+        self.max_samples = max_samples
+        self.pages = set(pages)
+        self.samples = defaultdict(lambda: defaultdict(lambda: deque(maxlen=self.max_samples)))
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def add_report(self, report: dict):
+        """
+        Add a single report from the browser.
+        :param report: The decoded report, see telemetry_script for the shape
+        """
+        # only the option_menu pages are accepted, so a client cannot make up page names
+        page = report.get("page")
+        if not isinstance(page, str) or page not in self.pages:
+            return
+
+        # flatten the report into (metric, value) samples, ignoring parts of the wrong shape
+        values = []
+        navigation = report.get("navigation")
+        if isinstance(navigation, dict):
+            for metric, value in navigation.items():
+                if metric in NAVIGATION_METRICS:
+                    values.append((metric, value))
+        values.append(("lcp", report.get("lcp")))
+        images = report.get("images")
+        if isinstance(images, list):
+            for duration in images:
+                values.append(("image_load", duration))
+        values.append(("images_complete", report.get("images_complete")))
+
+        with self.lock:
+            for metric, value in values:
+                if is_sample(value):
+                    self.samples[page][metric].append(float(value))
+                    self.dirty = True
+
+    def summary(self) -> dict:
+        """
+        Build the percentile summary of every page and metric.
+        Must be called with the lock held.
+        :return: A dictionary of page -> metric -> {count, p50, p75, p95}
+        """
+        result = {}
+        for page, metrics in self.samples.items():
+            result[page] = {}
+            for metric, samples in metrics.items():
+                stats = {"count": len(samples)}
+                for p in PERCENTILES:
+                    stats[f"p{p}"] = round(percentile(samples, p), 1)
+                result[page][metric] = stats
+        return result
+
+    def flush(self):
+        """
+        Write the summary to disk if there are new samples, replacing the previous file atomically.
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+            summary = self.summary()
+            self.dirty = False
+
+            directory = os.path.dirname(self.output_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.output_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(summary, f, indent=4)
+            os.replace(temp_path, self.output_path)
+
+    def flush_forever(self, interval=FLUSH_INTERVAL):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Failed to write the telemetry summary to %s", self.output_path)
+
+
+def _make_handler(collector: RumCollector):
+    class RumRequestHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/rum":
+                self.send_error(404)
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                self.send_error(400)
+                return
+            if length <= 0 or length > MAX_BODY_BYTES:
+                self.send_error(413)
+                return
+            try:
+                report = json.loads(self.rfile.read(length))
+            except ValueError:
+                self.send_error(400)
+                return
+            if isinstance(report, dict):
+                collector.add_report(report)
+            self.send_response(204)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            # the reports arrive on every page view, so keep them out of the streamlit log
+            pass
+
+    return RumRequestHandler
+
+
+@st.cache_resource
+def start_collector(port: int) -> RumCollector:
+    """
+    Start the collector in a background thread, once per server process.
+    :param port: The port to listen on
+    :return: The running collector, or None if it could not listen on the port
+    """
+    collector = RumCollector()
+    try:
+        server = ThreadingHTTPServer(("", port), _make_handler(collector))
+    except OSError:
+        # the failure is cached too, so it is only logged once and the pages still render
+        logger.exception("Failed to start the telemetry collector on port %d, telemetry is disabled", port)
+        return None
+
+    threading.Thread(target=server.serve_forever, name="rum-collector", daemon=True).start()
+    threading.Thread(target=collector.flush_forever, name="rum-collector-flush", daemon=True).start()
+    return collector
+
+
+def show_telemetry(page_name: str, pages):
+    """
+    Inject the browser side of the telemetry for the current page.
+    :param page_name: The option_menu name of the page being shown
+    :param pages: The option_menu names of every page, the only ones the collector accepts
+    """
+    if not COLLECTOR_PORT or page_name is None:
+        return
+
+    collector = start_collector(int(COLLECTOR_PORT))
+    if collector is None:
+        return
+    collector.pages.update(pages or ())
+
+    script = telemetry_script.replace("{page}", json.dumps(page_name)).replace("{port}", str(int(COLLECTOR_PORT)))
+    components.html(script, height=0)
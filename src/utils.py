@@ -1,13 +1,21 @@
 """
 Utility functions for the Streamlit application.
 
-This script provides utility functions for loading images and markdown content,
-which are used throughout the Streamlit app.
+This script provides utility functions for loading images, markdown and json content,
+which are used throughout the Streamlit app. The loaders are cached for CONTENT_TTL
+seconds, so the content of a page is read from disk at most once a minute, and edits
+to content/ and images/ show up within a minute without restarting the server.
 """
 
 import base64
+import json
 from contextlib import contextmanager
 import streamlit as st
+from atlas import load_atlas, atlas_thumbnail_html
+
+
+# how long loaded content is cached for, in seconds
+CONTENT_TTL = 60
 
 
 HORIZONTAL_STYLE = """
@@ -41,6 +49,7 @@ HORIZONTAL_STYLE = """
 """
 
 
+@st.cache_data(ttl=CONTENT_TTL)
 def load_image(image_name: str, path="", extension="jpeg") -> bytes:
     """
     Load an image and convert it to base64 format for use in HTML.
@@ -53,6 +62,7 @@ def load_image(image_name: str, path="", extension="jpeg") -> bytes:
         return content
 
 
+@st.cache_data(ttl=CONTENT_TTL)
 def load_markdown(content_name: str) -> str:
     """
     Load a markdown file and return its content as a string.
@@ -64,6 +74,18 @@ def load_markdown(content_name: str) -> str:
         return content
 
 
+@st.cache_data(ttl=CONTENT_TTL)
+def load_json(content_name: str) -> dict:
+    """
+    Load a json content file and return its data.
+    :param content_name: Name of the json file (without extension)
+    :return: Data of the json file
+    """
+    with open(f"content/{content_name}.json", "r") as f:
+        data = json.load(f)
+        return data
+
+
 @contextmanager
 def st_horizontal():
     st.markdown(HORIZONTAL_STYLE, unsafe_allow_html=True)
@@ -100,7 +122,11 @@ def show_section(section: dict, image_folder=None):
     
     Args:
         section (dict or iterable): A collection of items to be displayed.
+        image_folder (str): The folder of the item thumbnails, if the items have them.
     """
+    # use the sprite atlas of the image folder when it has been built
+    atlas = load_atlas(image_folder) if image_folder else None
+
     for key, item in section:
         # Render the title
         st.markdown(f"#### {item['title']}")
@@ -119,7 +145,10 @@ def show_section(section: dict, image_folder=None):
             c1, c2 = st.columns([0.2, 0.8])
             with c1:
                 # Render the image
-                st.image(f"{image_folder}/{key}.jpg", use_container_width=True)
+                if atlas and key in atlas["items"]:
+                    st.markdown(atlas_thumbnail_html(atlas, key), unsafe_allow_html=True)
+                else:
+                    st.image(f"{image_folder}/{key}.jpg", use_container_width=True)
             with c2:
                 # Render the subtitle
                 if "subtitle" in item:
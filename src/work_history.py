@@ -6,8 +6,7 @@ showcasing academic background and educational achievements.
 """
 
 import streamlit as st
-import json
-from utils import show_section
+from utils import load_json, show_section
 
 
 def show_work_history():
@@ -17,8 +16,7 @@ def show_work_history():
     Renders a header for the education section in the Streamlit app.
     """
     # Load education data from JSON file
-    with open(f"content/work_history.json", "r") as file:
-        data = json.load(file)
+    data = load_json("work_history")
 
     # Extract main and section titles
     main_title = data["main_title"]
@@ -43,4 +41,4 @@ def show_work_history():
             st.markdown("---")
 
             other = data["other"]
-            show_section(other.items())
\ No newline at end of file
+            show_section(other.items())